@@ -1,135 +1,216 @@
-from abc import ABC, abstractmethod
+import logging
 from dataclasses import dataclass
 from typing import Tuple
 
+import numpy as np
+from numba import guvectorize, njit
 
-@dataclass
+log = logging.getLogger(__name__)
+
+# Gamma for beta < 1, 1 <= beta <= 2.4 and beta > 2.4. The upper edge is the
+# next float above 2.4 so that beta == 2.4 still maps to 2/3.
+_GAMMA = np.array([1 / 3, 2 / 3, 1.0])
+_GAMMA_EDGES = np.array([1.0, np.nextafter(2.4, np.inf)])
+
+
+@dataclass(slots=True)
 class StakingData:
     FYAP: float  # Fixed Yearly Annual Percentage (e.g., 0.08 for 8%)
     BBN_TS: float  # Total Supply of BBN (e.g., 10_000_000_000)
     BTC_Stake: float  # Total BTC Staked (e.g., 10_000_000_000)
     BBN_SR: float  # Current BBN Staking Rate (e.g., 0.4001)
     Price_BBN: float  # Price of BBN (e.g., $1.0)
-    Price_BTC: float  # Price of BTC (e.g., $30,000)
+    Price_BTC: float  # Price of BTC (e.g., $30,000); unused in current model
+    split_BBN: float = 0.0  # Share of FYAP going to BBN stakers, set with the APYs
+    split_BTC: float = 0.0  # Share of FYAP going to BTC stakers, set with the APYs
 
 
-@dataclass
+@dataclass(slots=True)
 class APYResults:
     BBN_APY: float
     BTC_APY: float
 
 
-class StakingAPYCalculator(ABC):
-    @abstractmethod
-    def calculate_beta(self, staking_data: StakingData) -> float:
-        pass
-
-    @abstractmethod
-    def calculate_gamma(self, beta: float) -> float:
-        pass
-
-    @abstractmethod
-    def calculate_splits(self, gamma: float):
-        pass
-
-    @abstractmethod
-    def calculate_BBN_APY(self, staking_data: StakingData) -> float:
-        pass
-
-    @abstractmethod
-    def calculate_BTC_APY(self, staking_data: StakingData) -> float:
-        pass
-
-    @abstractmethod
-    def calculate_APYs(self, staking_data: StakingData) -> APYResults:
-        pass
-
-
-class BBNBTCStakingAPYCalculator(StakingAPYCalculator):
-    def calculate_beta(self, staking_data: StakingData) -> float:
-        """Calculate the staking ratio beta."""
-        beta = staking_data.BBN_SR / 0.4  # Stake Target is assumed to be 0.4
-        print(f"Calculated Beta (β): {beta}")
-        return beta
-
-    def calculate_gamma(self, beta: float) -> float:
-        """Calculate Gamma based on beta."""
-        if beta < 1:
-            gamma = (1 / 4) / (3 / 4)  # 1/3
-        elif 1 <= beta <= 2.4:
-            gamma = 0.4 / 0.6  # 2/3
-        elif beta > 2.4:
-            gamma = 0.5 / 0.5  # 1
-        print(f"Calculated Gamma (Γ): {gamma}")
-        return gamma
-
-    def calculate_splits(self, gamma: float):
-        """Calculate the split between BBN and BTC based on gamma."""
-        # Split_BBN / Split_BTC = gamma
-        # Split_BBN + Split_BTC = 1
-        # Solve for Split_BTC: Split_BTC = 1 / (gamma + 1)
-        if gamma + 1 == 0:
-            raise ValueError("Invalid Gamma value leading to division by zero.")
-        Split_BTC = 1 / (gamma + 1)
-        Split_BBN = 1 - Split_BTC
-        print(f"Calculated Splits: Split_BBN = {Split_BBN}, Split_BTC = {Split_BTC}")
-        return Split_BBN, Split_BTC
-
-    def calculate_BBN_APY(self, staking_data: StakingData) -> float:
-        """Calculate the APY for BBN stakers."""
-        BBN_APY = (
-            staking_data.FYAP * staking_data.split_BBN / staking_data.BBN_SR
-        ) * 100
-        print(f"Calculated BBN_APY: {BBN_APY}%")
-        return BBN_APY
-
-    def calculate_BTC_APY(self, staking_data: StakingData) -> float:
-        """Calculate the APY for BTC stakers."""
-        # Calculate BBN Fully Diluted Valuation (BBN_FDV)
-        BBN_FDV = staking_data.BBN_TS * staking_data.Price_BBN
-        print(f"Calculated BBN_FDV: ${BBN_FDV}")
-        # Calculate Amount_of_BTC distributed
-        Amount_of_BTC = (
-            staking_data.FYAP
-            * staking_data.split_BTC
-            * BBN_FDV
-            / staking_data.Price_BTC
+def calculate_beta(staking_data: StakingData) -> float:
+    """Calculate the staking ratio beta."""
+    beta = staking_data.BBN_SR / 0.4  # Stake Target is assumed to be 0.4
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Calculated Beta (β): %s", beta)
+    return beta
+
+
+def calculate_gamma(beta: float) -> float:
+    """Calculate Gamma based on beta."""
+    gamma = float(_GAMMA[np.searchsorted(_GAMMA_EDGES, beta, side="right")])
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Calculated Gamma (Γ): %s", gamma)
+    return gamma
+
+
+def _gamma_vec(beta: np.ndarray) -> np.ndarray:
+    """Branchless calculate_gamma for arrays of beta."""
+    return np.where(beta < 1.0, 1.0 / 3.0, np.where(beta <= 2.4, 2.0 / 3.0, 1.0))
+
+
+def calculate_splits_vec(bbn_sr):
+    """Calculate beta, gamma and the BBN/BTC splits for an array of BBN_SR.
+
+    Returns (beta, gamma, split_BBN, split_BTC) as float64 arrays.
+    """
+    beta = np.asarray(bbn_sr, dtype=np.float64) / 0.4  # Stake Target is 0.4
+    gamma = _gamma_vec(beta)
+    split_btc = 1 / (gamma + 1)
+    split_bbn = 1 - split_btc
+    return beta, gamma, split_bbn, split_btc
+
+
+def calculate_splits(gamma: float):
+    """Calculate the split between BBN and BTC based on gamma."""
+    # Split_BBN / Split_BTC = gamma
+    # Split_BBN + Split_BTC = 1
+    # Solve for Split_BTC: Split_BTC = 1 / (gamma + 1)
+    if gamma + 1 == 0:
+        raise ValueError("Invalid Gamma value leading to division by zero.")
+    Split_BTC = 1 / (gamma + 1)
+    Split_BBN = 1 - Split_BTC
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(
+            "Calculated Splits: Split_BBN = %s, Split_BTC = %s",
+            Split_BBN,
+            Split_BTC,
         )
-        print(f"Calculated Amount_of_BTC: {Amount_of_BTC} BTC")
-
-        # Calculate BTC_APY
-        #                btc_apy = amount_of_btc / (self.BTC_stake / btc_price) * 100
-
-        BTC_APY = (
-            Amount_of_BTC / (staking_data.BTC_Stake / staking_data.Price_BTC)
-        ) * 100
-        print(f"Calculated BTC_APY: {BTC_APY}%")
-        return BTC_APY
-
-    def calculate_APYs(self, staking_data: StakingData) -> APYResults:
-        """Calculate both BBN and BTC APYs."""
-        beta = self.calculate_beta(staking_data)
-        gamma = self.calculate_gamma(beta)
-        # Optionally, recalculate splits if needed
-        Split_BBN, Split_BTC = self.calculate_splits(gamma)
-        staking_data.split_BBN = Split_BBN
-        staking_data.split_BTC = Split_BTC
-        # Update splits in staking_data if using dynamic splits
-        # For now, using provided splits
-        BBN_APY = self.calculate_BBN_APY(staking_data)
-        BTC_APY = self.calculate_BTC_APY(staking_data)
-        return APYResults(BBN_APY=BBN_APY, BTC_APY=BTC_APY)
+    return Split_BBN, Split_BTC
+
+
+def calculate_BBN_APY(staking_data: StakingData) -> float:
+    """Calculate the APY for BBN stakers."""
+    BBN_APY = (staking_data.FYAP * staking_data.split_BBN / staking_data.BBN_SR) * 100
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Calculated BBN_APY: %s%%", BBN_APY)
+    return BBN_APY
+
+
+def calculate_BTC_APY(staking_data: StakingData) -> float:
+    """Calculate the APY for BTC stakers."""
+    # BTC_APY = Amount_of_BTC / (BTC_Stake / Price_BTC) * 100, where
+    # Amount_of_BTC = FYAP * split_BTC * BBN_FDV / Price_BTC and
+    # BBN_FDV = BBN_TS * Price_BBN, so Price_BTC cancels out.
+    BTC_APY = (
+        staking_data.FYAP
+        * staking_data.split_BTC
+        * staking_data.BBN_TS
+        * staking_data.Price_BBN
+        / staking_data.BTC_Stake
+    ) * 100
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Calculated BTC_APY: %s%%", BTC_APY)
+    return BTC_APY
+
+
+def calculate_APYs(staking_data: StakingData) -> APYResults:
+    """Calculate both BBN and BTC APYs."""
+    beta = calculate_beta(staking_data)
+    gamma = calculate_gamma(beta)
+    # Optionally, recalculate splits if needed
+    Split_BBN, Split_BTC = calculate_splits(gamma)
+    staking_data.split_BBN = Split_BBN
+    staking_data.split_BTC = Split_BTC
+    # Update splits in staking_data if using dynamic splits
+    # For now, using provided splits
+    BBN_APY = calculate_BBN_APY(staking_data)
+    BTC_APY = calculate_BTC_APY(staking_data)
+    return APYResults(BBN_APY=BBN_APY, BTC_APY=BTC_APY)
+
+
+@njit(cache=True)
+def _apy_kernel(fyap, bbn_ts, btc_stake, bbn_sr, price_bbn):
+    """Compiled closed form of calculate_APYs.
+
+    Returns (split_BBN, split_BTC, BBN_APY, BTC_APY).
+    """
+    beta = bbn_sr / 0.4
+    if beta < 1.0:
+        gamma = 1.0 / 3.0
+    elif beta <= 2.4:
+        gamma = 2.0 / 3.0
+    else:
+        gamma = 1.0
+    split_btc = 1.0 / (gamma + 1.0)
+    split_bbn = 1.0 - split_btc
+    bbn_apy = fyap * split_bbn / bbn_sr * 100.0
+    btc_apy = fyap * split_btc * bbn_ts * price_bbn / btc_stake * 100.0
+    return split_bbn, split_btc, bbn_apy, btc_apy
+
+
+@guvectorize(
+    [
+        "void(f4[:], f4[:], f4[:], f4, f4, f4, f4[:], f4[:, :])",
+        "void(f8[:], f8[:], f8[:], f8, f8, f8, f8[:], f8[:, :])",
+    ],
+    "(n),(n),(m),(),(),()->(n),(n,m)",
+    nopython=True,
+    cache=True,
+)
+def simulate_staking_apy_grid(
+    bbn_sr, split_btc, btc_stake, fyap, bbn_ts, price_bbn, bbn_apy, btc_apy
+):
+    """Compute BBN and BTC APYs over every (BBN_SR, BTC_Stake) pair.
+
+    split_btc holds Split_BTC for each BBN_SR, as returned by
+    calculate_splits_vec. BBN_APY does not depend on BTC_Stake, so it is
+    returned with shape (len(bbn_sr),); BTC_APY has shape
+    (len(bbn_sr), len(btc_stake)). Both are in percent.
+    """
+    for i in range(bbn_sr.size):
+        bbn_apy[i] = fyap * (1.0 - split_btc[i]) / bbn_sr[i] * 100.0
+        # BTC rewards (in BBN value, as a percentage) are fixed for this row
+        btc_rewards = fyap * split_btc[i] * bbn_ts * price_bbn * 100.0
+        for j in range(btc_stake.size):
+            btc_apy[i, j] = btc_rewards / btc_stake[j]
+
+
+def simulate_staking_apy_vec(
+    fyap, bbn_ts, btc_stake, bbn_sr, price_bbn, dtype=np.float64
+):
+    """Vectorized simulate_staking_apy over arrays of BTC_Stake and BBN_SR.
+
+    Gamma tiers are decided in float64 by calculate_splits_vec; the APY grid
+    is then evaluated in dtype. Returns (BBN_APY, BTC_APY) in percent, with
+    shapes (len(bbn_sr),) and (len(bbn_sr), len(btc_stake)).
+    """
+    scalar = np.dtype(dtype).type
+    _, _, _, split_btc = calculate_splits_vec(bbn_sr)
+    return simulate_staking_apy_grid(
+        np.asarray(bbn_sr, dtype=dtype),
+        split_btc.astype(dtype),
+        np.asarray(btc_stake, dtype=dtype),
+        scalar(fyap),
+        scalar(bbn_ts),
+        scalar(price_bbn),
+    )
 
 
 def simulate_staking_apy(staking_data: StakingData) -> APYResults:
-    """Simulate the staking APY calculations."""
-    calculator = BBNBTCStakingAPYCalculator()
-    results = calculator.calculate_APYs(staking_data)
-    return results
+    """Simulate the staking APY calculations.
+
+    Like calculate_APYs, this also sets split_BBN and split_BTC on
+    staking_data, but without logging the intermediate values.
+    """
+    Split_BBN, Split_BTC, BBN_APY, BTC_APY = _apy_kernel(
+        staking_data.FYAP,
+        staking_data.BBN_TS,
+        staking_data.BTC_Stake,
+        staking_data.BBN_SR,
+        staking_data.Price_BBN,
+    )
+    staking_data.split_BBN = Split_BBN
+    staking_data.split_BTC = Split_BTC
+    return APYResults(BBN_APY=BBN_APY, BTC_APY=BTC_APY)
 
 
 # Example Usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
     bbn_sr_list = [0.2]  # , 0.5, 1]
     for bbn_sr in bbn_sr_list:
         for price_bbn in [0.1]:  # , 0.5, 0.8, 1.5]:
@@ -152,9 +233,9 @@ if __name__ == "__main__":
                     Price_BTC=75_000,  # $75,000 per BTC
                 )
 
-                # Run the simulation
-                apy_results = simulate_staking_apy(staking_data)
+                # Run the step-by-step calculation to log intermediate values
+                apy_results = calculate_APYs(staking_data)
                 # Display the results
                 print("\n--- APY Results ---")
                 print(f"BBN APY: {apy_results.BBN_APY:.4f}%")
-                print(f"BTC APY: {apy_results.BTC_APY:.4f}%\n")
\ No newline at end of file
+                print(f"BTC APY: {apy_results.BTC_APY:.4f}%\n")
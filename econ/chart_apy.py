@@ -2,252 +2,273 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from dynamic_inflation import StakingData, simulate_staking_apy
+from dynamic_inflation import calculate_splits_vec, simulate_staking_apy_vec
 import numpy as np
-import io
-import sys
-from abc import ABC, abstractmethod
-
-
-class PlotCreator(ABC):
-    @abstractmethod
-    def create_plot(self, results_df):
-        pass
-
-
-class APYPlotCreator(PlotCreator):
-    def create_plot(self, results_df):
-        """Create a plotly figure with the simulation results."""
-        fig = make_subplots(
-            rows=2,
-            cols=1,
-            subplot_titles=("BBN APY Results", "BTC APY Results"),
-            vertical_spacing=0.1,
-            row_heights=[0.5, 0.5],
-        )
-
-        # Add BBN APY trace
-        fig.add_trace(
-            go.Scatter(
-                x=results_df["BBN_SR"],
-                y=results_df["BBN_APY"],
-                name="BBN APY",
-                line=dict(color="#00ff9f", width=2),
-                mode="lines+markers",
-            ),
-            row=1,
-            col=1,
-        )
-
-        # Add BTC APY trace
-        fig.add_trace(
-            go.Scatter(
-                x=results_df["BBN_SR"],
-                y=results_df["BTC_APY"],
-                name="BTC APY",
-                line=dict(color="#00c3ff", width=2),
-                mode="lines+markers",
-            ),
-            row=2,
-            col=1,
-        )
-
-        # Update layout
-        fig.update_layout(
-            template="plotly_dark",
-            height=800,
-            showlegend=True,
-            paper_bgcolor="rgba(30,30,30,0.8)",
-            plot_bgcolor="rgba(30,30,30,0.8)",
-            margin=dict(l=50, r=50, t=50, b=50),
-        )
-
-        # Update x-axes labels
-        fig.update_xaxes(title_text="BBN_SR", row=1, col=1)
-        fig.update_xaxes(title_text="BBN_SR", row=2, col=1)
-        # Update y-axes labels
-        fig.update_yaxes(title_text="BBN_APY (%)", row=1, col=1)
-        fig.update_yaxes(title_text="BTC_APY (%)", row=2, col=1)
-
-        return fig
 
 
-class PrintCapture(ABC):
-    @abstractmethod
-    def capture_prints(self):
-        pass
-
-
-class PrintCaptureImpl(PrintCapture):
-    def capture_prints(self):
-        """Context manager to capture print statements."""
-        output = io.StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = output
-        return output, old_stdout
+@st.cache_resource(show_spinner=False)
+def figure_template():
+    """Build the empty two-panel APY figure shared by every plot."""
+    fig = make_subplots(
+        rows=2,
+        cols=1,
+        subplot_titles=("BBN APY Results", "BTC APY Results"),
+        vertical_spacing=0.1,
+        row_heights=[0.5, 0.5],
+    )
+
+    # Add BBN APY trace
+    fig.add_trace(
+        go.Scattergl(
+            name="BBN APY",
+            line=dict(color="#00ff9f", width=2),
+            mode="lines+markers",
+            hovertemplate="BBN_SR=%{x:.4f}<br>BBN_APY=%{y:.4f}%",
+        ),
+        row=1,
+        col=1,
+    )
+
+    # Add BTC APY trace
+    fig.add_trace(
+        go.Scattergl(
+            name="BTC APY",
+            line=dict(color="#00c3ff", width=2),
+            mode="lines+markers",
+            hovertemplate="BBN_SR=%{x:.4f}<br>BTC_APY=%{y:.4f}%",
+        ),
+        row=2,
+        col=1,
+    )
+
+    # Update layout
+    fig.update_layout(
+        template="plotly_dark",
+        height=800,
+        showlegend=True,
+        paper_bgcolor="rgba(30,30,30,0.8)",
+        plot_bgcolor="rgba(30,30,30,0.8)",
+        margin=dict(l=50, r=50, t=50, b=50),
+    )
+
+    # Update x-axes labels
+    fig.update_xaxes(title_text="BBN_SR", row=1, col=1)
+    fig.update_xaxes(title_text="BBN_SR", row=2, col=1)
+    # Update y-axes labels
+    fig.update_yaxes(title_text="BBN_APY (%)", row=1, col=1)
+    fig.update_yaxes(title_text="BTC_APY (%)", row=2, col=1)
+
+    return fig
+
+
+@st.cache_resource(show_spinner=False)
+def create_plot(results_df):
+    """Create a plotly figure with the simulation results."""
+    fig = go.Figure(figure_template())
+    bbn_sr = results_df["BBN_SR"].to_numpy()
+    fig.data[0].x = bbn_sr
+    fig.data[0].y = results_df["BBN_APY"].to_numpy()
+    fig.data[1].x = bbn_sr
+    fig.data[1].y = results_df["BTC_APY"].to_numpy()
+    return fig
+
+
+def format_details(details_df):
+    """Format sweep rows as the plain-text Calculation Details table.
+
+    Values are shown to 4 decimals, which hides the float32 rounding of the
+    APY columns (e.g. 8.0 rather than 7.999999).
+    """
+    return details_df[
+        [
+            "BBN_SR",
+            "Beta",
+            "Gamma",
+            "Split_BBN",
+            "Split_BTC",
+            "BBN_APY",
+            "BTC_APY",
+        ]
+    ].to_string(index=False, float_format="{:.4f}".format)
+
+
+@st.cache_data(show_spinner=False)
+def run_sweep(fyap, bbn_ts, price_bbn, bbn_sr_values, btc_stake_values):
+    """Run the APY simulation over every (BBN_SR, BTC_Stake) pair.
+
+    The ranges are passed as tuples so Streamlit can hash them for caching.
+    Gamma tiers and the BTC_Stake/BBN_SR/Beta columns stay in float64; only
+    the APY kernel runs in float32, which is ample for APYs shown to a few
+    decimals. Returns a tidy DataFrame with one row per pair; Stake_Index
+    numbers the BTC_Stake values so that equal stakes stay separate groups.
+    """
+    bbn_sr_arr = np.asarray(bbn_sr_values, dtype=np.float64)
+    btc_stake_arr = np.asarray(btc_stake_values, dtype=np.float64)
+
+    # Intermediate values for the Calculation Details table
+    beta, gamma, split_bbn, split_btc = calculate_splits_vec(bbn_sr_arr)
+
+    # Evaluate the full BBN_SR x BTC_Stake grid in one compiled call;
+    # BBN_APY is independent of BTC_Stake and comes back as one value per BBN_SR
+    bbn_apy, btc_apy_grid = simulate_staking_apy_vec(
+        fyap, bbn_ts, btc_stake_arr, bbn_sr_arr, price_bbn, dtype=np.float32
+    )
+
+    # Flatten the grids BTC_Stake-major so each BTC_Stake is a contiguous block
+    n_sr, n_stake = btc_apy_grid.shape
+    return pd.DataFrame(
+        {
+            "Stake_Index": np.repeat(np.arange(n_stake), n_sr),
+            "BTC_Stake": np.repeat(btc_stake_arr, n_sr),
+            "BBN_SR": np.tile(bbn_sr_arr, n_stake),
+            "Beta": np.tile(beta, n_stake),
+            "Gamma": np.tile(gamma, n_stake),
+            "Split_BBN": np.tile(split_bbn, n_stake),
+            "Split_BTC": np.tile(split_btc, n_stake),
+            "BBN_APY": np.tile(bbn_apy, n_stake),
+            "BTC_APY": btc_apy_grid.T.ravel(),
+        }
+    )
 
 
 class DynamicInflationApp:
-    def __init__(self):
-        self.plot_creator = APYPlotCreator()
-        self.print_capture = PrintCaptureImpl()
-
     def main(self):
         st.set_page_config(page_title="Dynamic Inflation Calculator", layout="wide")
         st.title("Dynamic Inflation Calculator")
 
-        # Sidebar inputs
-        st.sidebar.header("Parameters")
-
-        fyap = st.sidebar.number_input(
-            "FYAP (Fixed Yearly Annual Percentage)",
-            min_value=0.0,
-            max_value=1.0,
-            value=0.08,
-            format="%.3f",
-            help="e.g., 0.08 for 8%",
-        )
-
-        bbn_ts = st.sidebar.number_input(
-            "BBN Total Supply",
-            min_value=1_000_000_000,
-            max_value=100_000_000_000,
-            value=10_000_000_000,
-            format="%d",
-        )
-
-        price_bbn = st.sidebar.number_input(
-            "BBN Price ($)", min_value=0.0, max_value=1000.0, value=1.0, format="%.3f"
-        )
-
-        price_btc = st.sidebar.number_input(
-            "BTC Price ($)",
-            min_value=1000.0,
-            max_value=1000000.0,
-            value=75000.0,
-            format="%.2f",
-        )
-
-        # BBN_SR range inputs in sidebar
-        st.sidebar.subheader("BBN_SR Range Settings")
-        bbn_sr_start = st.sidebar.number_input(
-            "Start BBN_SR",
-            min_value=0.0,
-            max_value=1.0,
-            value=0.1,
-            format="%.3f",
-            help="Starting value for BBN_SR range",
-        )
-
-        bbn_sr_end = st.sidebar.number_input(
-            "End BBN_SR",
-            min_value=bbn_sr_start,
-            max_value=1.0,
-            value=1.0,
-            format="%.3f",
-            help="Ending value for BBN_SR range",
-        )
-
-        bbn_sr_steps = st.sidebar.number_input(
-            "Number of Steps",
-            min_value=2,
-            max_value=100,
-            value=10,
-            help="Number of points to calculate between start and end",
-        )
+        # Sidebar inputs, batched in a form so the sweep reruns once per submit
+        with st.sidebar.form("params_form"):
+            st.header("Parameters")
+
+            fyap = st.number_input(
+                "FYAP (Fixed Yearly Annual Percentage)",
+                min_value=0.0,
+                max_value=1.0,
+                value=0.08,
+                format="%.3f",
+                help="e.g., 0.08 for 8%",
+            )
+
+            bbn_ts = st.number_input(
+                "BBN Total Supply",
+                min_value=1_000_000_000,
+                max_value=100_000_000_000,
+                value=10_000_000_000,
+                format="%d",
+            )
+
+            price_bbn = st.number_input(
+                "BBN Price ($)",
+                min_value=0.0,
+                max_value=1000.0,
+                value=1.0,
+                format="%.3f",
+            )
+
+            # BBN_SR range inputs in sidebar
+            st.subheader("BBN_SR Range Settings")
+            bbn_sr_start = st.number_input(
+                "Start BBN_SR",
+                min_value=0.0,
+                max_value=1.0,
+                value=0.1,
+                format="%.3f",
+                help="Starting value for BBN_SR range",
+            )
+
+            bbn_sr_end = st.number_input(
+                "End BBN_SR",
+                min_value=0.0,
+                max_value=1.0,
+                value=1.0,
+                format="%.3f",
+                help="Ending value for BBN_SR range",
+            )
+
+            bbn_sr_steps = st.number_input(
+                "Number of Steps",
+                min_value=2,
+                max_value=100,
+                value=10,
+                help="Number of points to calculate between start and end",
+            )
+
+            # BTC_Stake range inputs in sidebar
+            st.subheader("BTC_Stake Range Settings")
+            btc_stake_start = st.number_input(
+                "Start BTC_Stake",
+                min_value=1_000_000_000,
+                max_value=100_000_000_000,
+                value=2_000_000_000,
+                format="%d",
+                help="Starting value for BTC_Stake range",
+            )
+
+            btc_stake_end = st.number_input(
+                "End BTC_Stake",
+                min_value=1_000_000_000,
+                max_value=100_000_000_000,
+                value=10_000_000_000,
+                format="%d",
+                help="Ending value for BTC_Stake range",
+            )
+
+            btc_stake_steps = st.number_input(
+                "Number of Steps",
+                min_value=2,
+                max_value=10,
+                value=5,
+                help="Number of points to calculate between start and end",
+            )
+
+            st.form_submit_button("Run")
+
+        # The End inputs have fixed bounds so their state survives a Start
+        # change on submit; check the ordering here instead
+        if bbn_sr_end < bbn_sr_start:
+            st.error("End BBN_SR must not be smaller than Start BBN_SR")
+            st.stop()
+        if btc_stake_end < btc_stake_start:
+            st.error("End BTC_Stake must not be smaller than Start BTC_Stake")
+            st.stop()
 
         # Create range of BBN_SR values for simulation
-        bbn_sr_range = pd.Series(np.linspace(bbn_sr_start, bbn_sr_end, bbn_sr_steps))
-
-        # BTC_Stake range inputs in sidebar
-        st.sidebar.subheader("BTC_Stake Range Settings")
-        btc_stake_start = st.sidebar.number_input(
-            "Start BTC_Stake",
-            min_value=1_000_000_000,
-            max_value=100_000_000_000,
-            value=2_000_000_000,
-            format="%d",
-            help="Starting value for BTC_Stake range",
-        )
-
-        btc_stake_end = st.sidebar.number_input(
-            "End BTC_Stake",
-            min_value=btc_stake_start,
-            max_value=100_000_000_000,
-            value=10_000_000_000,
-            format="%d",
-            help="Ending value for BTC_Stake range",
-        )
-
-        btc_stake_steps = st.sidebar.number_input(
-            "Number of Steps",
-            min_value=2,
-            max_value=10,
-            value=5,
-            help="Number of points to calculate between start and end",
-        )
+        bbn_sr_range = np.linspace(bbn_sr_start, bbn_sr_end, int(bbn_sr_steps))
 
         # Create range of BTC_Stake values for simulation
-        btc_stake_range = pd.Series(
-            np.linspace(btc_stake_start, btc_stake_end, btc_stake_steps)
+        btc_stake_range = np.linspace(
+            btc_stake_start, btc_stake_end, int(btc_stake_steps)
         )
 
-        # Run simulations for each BTC_Stake value
-        for btc_stake in btc_stake_range:
-            st.subheader(f"Results for BTC_Stake = {btc_stake:,}")
-
-            results = []
-            all_debug_output = []
-
-            # Run simulations for different BBN_SR values
-            for bbn_sr in bbn_sr_range:
-                staking_data = StakingData(
-                    FYAP=fyap,
-                    BBN_TS=bbn_ts,
-                    BTC_Stake=btc_stake,
-                    BBN_SR=bbn_sr,
-                    Price_BBN=price_bbn,
-                    Price_BTC=price_btc,
-                )
-
-                try:
-                    # Capture print output
-                    output, old_stdout = self.print_capture.capture_prints()
-
-                    apy_results = simulate_staking_apy(staking_data)
-
-                    # Restore stdout and get the captured output
-                    sys.stdout = old_stdout
-                    debug_output = output.getvalue()
-                    all_debug_output.append(f"\nFor BBN_SR = {bbn_sr}:\n{debug_output}")
-
-                    results.append(
-                        {
-                            "BBN_SR": bbn_sr,
-                            "Beta": bbn_sr / 0.4,
-                            "BBN_APY": apy_results.BBN_APY,
-                            "BTC_APY": apy_results.BTC_APY,
-                        }
-                    )
-                except Exception as e:
-                    st.error(f"Error in simulation for BBN_SR={bbn_sr}: {str(e)}")
-                    continue
+        # BBN_SR == 0 has no defined BBN APY; report and skip those points
+        for bbn_sr in bbn_sr_range[bbn_sr_range == 0]:
+            st.error(f"Error in simulation for BBN_SR={bbn_sr}: float division by zero")
+        bbn_sr_range = bbn_sr_range[bbn_sr_range != 0]
+
+        # Reuse the last sweep until the submitted parameters change
+        params = (fyap, bbn_ts, price_bbn, tuple(bbn_sr_range), tuple(btc_stake_range))
+        if st.session_state.get("sweep_params") != params:
+            st.session_state.sweep_params = params
+            st.session_state.sweep_df = run_sweep(*params)
+        sweep_df = st.session_state.sweep_df
 
-            # Create DataFrame from results for this BTC_Stake
-            results_df = pd.DataFrame(results)
+        # Display results for each BTC_Stake value
+        for _, results_df in sweep_df.groupby("Stake_Index", sort=False):
+            btc_stake = results_df["BTC_Stake"].iloc[0]
+            st.subheader(f"Results for BTC_Stake = {btc_stake:,.0f}")
 
             # Display plots for this BTC_Stake
             if not results_df.empty:
 
                 # Display calculation details in an expander
                 with st.expander(
-                    f"Show Calculation Details for BTC_Stake = {btc_stake:,}",
+                    f"Show Calculation Details for BTC_Stake = {btc_stake:,.0f}",
                     expanded=False,
                 ):
                     # Create tabs for different BBN_SR ranges
                     tab_size = 10
-                    num_tabs = len(all_debug_output) // tab_size + (
-                        1 if len(all_debug_output) % tab_size else 0
+                    num_tabs = len(results_df) // tab_size + (
+                        1 if len(results_df) % tab_size else 0
                     )
 
                     tabs = st.tabs([f"BBN_SR Range {i+1}" for i in range(num_tabs)])
@@ -255,11 +276,12 @@ class DynamicInflationApp:
                     for tab_idx, tab in enumerate(tabs):
                         with tab:
                             start_idx = tab_idx * tab_size
-                            end_idx = min(start_idx + tab_size, len(all_debug_output))
+                            end_idx = min(start_idx + tab_size, len(results_df))
 
-                            for i in range(start_idx, end_idx):
-                                st.text(all_debug_output[i])
-                fig = self.plot_creator.create_plot(results_df)
+                            # Intermediate values of the sweep, one row per BBN_SR
+                            details_df = results_df.iloc[start_idx:end_idx]
+                            st.code(format_details(details_df), language=None)
+                fig = create_plot(results_df)
                 st.plotly_chart(fig, use_container_width=True)
 
 
@@ -0,0 +1,64 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from chart_apy import format_details, run_sweep
+from dynamic_inflation import StakingData, calculate_APYs
+
+# BBN_SR values just around the gamma tier edges at beta == 1 and beta == 2.4
+BOUNDARY_BBN_SR = (
+    0.3999999999999999,
+    0.39999999999999997,
+    0.4,
+    0.96,
+    0.9600000000000002,
+)
+
+
+def test_run_sweep_matches_float64_reference():
+    """The float32 sweep stays within 1e-4 % of the float64 calculator."""
+    bbn_sr_values = tuple(np.linspace(0.0, 0.42, 64)[1:]) + BOUNDARY_BBN_SR
+    btc_stake_values = (1_234_567_891.0, 2_000_000_000.0, 10_000_000_000.0)
+    results_df = run_sweep(0.08, 10_000_000_000, 1.0, bbn_sr_values, btc_stake_values)
+
+    pairs = itertools.product(btc_stake_values, bbn_sr_values)
+    for row, (btc_stake, bbn_sr) in zip(results_df.itertuples(), pairs, strict=True):
+        expected = calculate_APYs(
+            StakingData(
+                FYAP=0.08,
+                BBN_TS=10_000_000_000,
+                BTC_Stake=btc_stake,
+                BBN_SR=bbn_sr,
+                Price_BBN=1.0,
+                Price_BTC=75_000.0,
+            )
+        )
+        assert row.BBN_APY == pytest.approx(expected.BBN_APY, rel=1e-6)
+        assert row.BTC_APY == pytest.approx(expected.BTC_APY, rel=1e-6)
+
+
+def test_run_sweep_keeps_inputs_in_float64():
+    results_df = run_sweep(
+        0.08, 10_000_000_000, 1.0, (0.1, 0.39999999999999997), (1_234_567_891.0,)
+    )
+
+    assert results_df["BTC_Stake"].tolist() == [1_234_567_891.0, 1_234_567_891.0]
+    assert results_df["BBN_SR"].tolist() == [0.1, 0.39999999999999997]
+
+
+def test_run_sweep_keeps_equal_stakes_apart():
+    results_df = run_sweep(
+        0.08, 10_000_000_000, 1.0, (0.1, 0.5, 1.0), (2_000_000_000.0,) * 5
+    )
+
+    group_sizes = results_df.groupby("Stake_Index", sort=False).size()
+    assert group_sizes.tolist() == [3] * 5
+
+
+def test_format_details_shows_exact_tier_values():
+    results_df = run_sweep(0.08, 10_000_000_000, 1.0, (0.4,), (2_000_000_000.0,))
+
+    details = format_details(results_df).splitlines()
+    assert details[1].split()[0] == "0.4000"
+    assert details[1].split()[-2] == "8.0000"
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from dynamic_inflation import (
+    StakingData,
+    calculate_APYs,
+    simulate_staking_apy,
+    simulate_staking_apy_vec,
+)
+
+# The gamma tier edges (beta == 1 and beta == 2.4) and their float neighbours
+TIER_EDGE_BBN_SR = [
+    float(value)
+    for edge in (0.4, 0.96)
+    for value in (np.nextafter(edge, 0.0), edge, np.nextafter(edge, 1.0))
+]
+
+
+def make_staking_data(bbn_sr, btc_stake=2_000_000_000.0):
+    return StakingData(
+        FYAP=0.08,
+        BBN_TS=10_000_000_000,
+        BTC_Stake=btc_stake,
+        BBN_SR=bbn_sr,
+        Price_BBN=1.0,
+        Price_BTC=75_000.0,
+    )
+
+
+@pytest.mark.parametrize("bbn_sr", TIER_EDGE_BBN_SR)
+def test_simulate_staking_apy_matches_calculate_APYs_at_tier_edges(bbn_sr):
+    compiled_data = make_staking_data(bbn_sr)
+    reference_data = make_staking_data(bbn_sr)
+
+    result = simulate_staking_apy(compiled_data)
+    expected = calculate_APYs(reference_data)
+
+    assert compiled_data.split_BBN == pytest.approx(reference_data.split_BBN)
+    assert compiled_data.split_BTC == pytest.approx(reference_data.split_BTC)
+    assert result.BBN_APY == pytest.approx(expected.BBN_APY, rel=1e-12)
+    assert result.BTC_APY == pytest.approx(expected.BTC_APY, rel=1e-12)
+
+
+def test_simulate_staking_apy_vec_matches_calculate_APYs():
+    bbn_sr_values = np.array([0.1, 0.39999999999999997, 0.4, 0.5, 0.96, 1.0])
+    btc_stake_values = np.array([2_000_000_000.0, 10_000_000_000.0])
+
+    bbn_apy, btc_apy = simulate_staking_apy_vec(
+        0.08, 10_000_000_000, btc_stake_values, bbn_sr_values, 1.0
+    )
+
+    assert bbn_apy.shape == (6,)
+    assert btc_apy.shape == (6, 2)
+    for i, bbn_sr in enumerate(bbn_sr_values):
+        for j, btc_stake in enumerate(btc_stake_values):
+            expected = calculate_APYs(make_staking_data(bbn_sr, btc_stake))
+            assert bbn_apy[i] == pytest.approx(expected.BBN_APY, rel=1e-12)
+            assert btc_apy[i, j] == pytest.approx(expected.BTC_APY, rel=1e-12)